@@ -1,4 +1,21 @@
+import compileall
+
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+
+class _BuildPyWithCompile(build_py):
+    """Byte-compile the package at build time so the wheel ships .pyc files.
+
+    Bytecode is written at the default optimization level, which is what a
+    plain ``python`` interpreter loads. Set SOURCE_DATE_EPOCH for
+    reproducible bytecode timestamps.
+    """
+
+    def run(self):
+        super().run()
+        compileall.compile_dir(self.build_lib, quiet=1)
+
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -36,6 +53,8 @@ setup(
         ],
     },
     include_package_data=True,
+    zip_safe=False,
+    cmdclass={'build_py': _BuildPyWithCompile},
     package_data={
         'syzygia': ['data/*'],
     },
@@ -2,13 +2,29 @@
 Syzygia - A custom package manager for Arch Linux
 """
 
+import importlib
+
 __version__ = '0.1.0'
 
-# Core components
-from .cli import main
-from .config import Config
-from .mirror import MirrorManager
-from .package import PackageManager
-from .repo import Repository
+# Core components are imported lazily so that ``import syzygia`` (and the CLI
+# entry point) does not pay for loading requests, configparser, etc. up front.
+_LAZY_ATTRS = {
+    'main': '.cli',
+    'Config': '.config',
+    'MirrorManager': '.mirror',
+    'PackageManager': '.package',
+    'Repository': '.repo',
+}
 
 __all__ = ['main', 'Config', 'MirrorManager', 'PackageManager', 'Repository']
+
+
+def __getattr__(name):
+    """Import core components on first access."""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,28 +1,10 @@
 """Command-line interface for Syzygia."""
 
-import argparse
 import sys
-from typing import List, Optional, Any, Dict
+from functools import cached_property
+from typing import List, Optional
 
-from .config import Config
-from .mirror import MirrorManager
-from .package import PackageManager, Package
-from .repo import RepositoryManager
-
-class SyzygiaCLI:
-    """Command-line interface for Syzygia package manager."""
-    
-    def __init__(self):
-        """Initialize the CLI with configuration and managers."""
-        self.config = Config()
-        self.mirror_manager = MirrorManager(self.config)
-        self.repo_manager = RepositoryManager(self.config)
-        self.pkg_manager = PackageManager(self.config, self.mirror_manager)
-        
-        # Set up argument parser
-        self.parser = argparse.ArgumentParser(
-            description='Syzygia - A custom package manager for Arch Linux',
-            usage='''syzygia <command> [<args>]
+_USAGE = '''syzygia <command> [<args>]
 
 Available commands:
   install     Install packages
@@ -33,9 +15,59 @@ Available commands:
   list        List installed packages
   mirror      Manage mirrors
   repo        Manage repositories
-''')
-        
+'''
+
+_DESCRIPTION = 'Syzygia - A custom package manager for Arch Linux'
+
+# Printed for bare `syzygia` and -h/--help without importing argparse
+_STATIC_HELP = f"usage: {_USAGE}"
+
+# Subcommands dispatched to the SyzygiaCLI handler of the same name
+_COMMANDS = ('install', 'remove', 'update', 'upgrade', 'search', 'list', 'mirror', 'repo')
+
+
+def _make_parser(description: str, **kwargs):
+    """Create an argument parser, importing argparse only when one is needed."""
+    import argparse
+    return argparse.ArgumentParser(description=description, **kwargs)
+
+
+class SyzygiaCLI:
+    """Command-line interface for Syzygia package manager."""
+    
+    def __init__(self):
+        """Initialize the CLI.
+
+        Configuration and managers are constructed on first use, so only the
+        handler that actually runs pays for them.
+        """
+        # Set up argument parser
+        self.parser = _make_parser(_DESCRIPTION, usage=_USAGE)
         self.parser.add_argument('command', help='Command to run')
+
+    @cached_property
+    def config(self):
+        """Loaded Syzygia configuration."""
+        from .config import Config
+        return Config()
+
+    @cached_property
+    def mirror_manager(self):
+        """Mirror manager bound to the CLI configuration."""
+        from .mirror import MirrorManager
+        return MirrorManager(self.config)
+
+    @cached_property
+    def repo_manager(self):
+        """Repository manager bound to the CLI configuration."""
+        from .repo import RepositoryManager
+        return RepositoryManager(self.config)
+
+    @cached_property
+    def pkg_manager(self):
+        """Package manager bound to the CLI configuration."""
+        from .package import PackageManager
+        return PackageManager(self.config, self.mirror_manager, self.repo_manager)
         
     def run(self, args: Optional[List[str]] = None) -> int:
         """Run the CLI with the given arguments.
@@ -55,7 +87,7 @@ Available commands:
         args = self.parser.parse_args(args or sys.argv[1:2])
         
         # Dispatch to the appropriate handler
-        if not hasattr(self, args.command):
+        if args.command not in _COMMANDS:
             print(f"Unknown command: {args.command}")
             self.parser.print_help()
             return 1
@@ -64,7 +96,7 @@ Available commands:
     
     def install(self) -> int:
         """Handle the 'install' command."""
-        parser = argparse.ArgumentParser(description='Install packages')
+        parser = _make_parser('Install packages')
         parser.add_argument('packages', nargs='+', help='Packages to install')
         parser.add_argument('--nodeps', action='store_true', help='Skip dependency checks')
         args = parser.parse_args(sys.argv[2:])
@@ -77,7 +109,7 @@ Available commands:
     
     def remove(self) -> int:
         """Handle the 'remove' command."""
-        parser = argparse.ArgumentParser(description='Remove packages')
+        parser = _make_parser('Remove packages')
         parser.add_argument('packages', nargs='+', help='Packages to remove')
         parser.add_argument('--nodeps', action='store_true', help='Skip dependency checks')
         args = parser.parse_args(sys.argv[2:])
@@ -90,7 +122,7 @@ Available commands:
     
     def update(self) -> int:
         """Handle the 'update' command."""
-        parser = argparse.ArgumentParser(description='Update package database')
+        parser = _make_parser('Update package database')
         parser.add_argument('--refresh', action='store_true', help='Refresh mirror list')
         args = parser.parse_args(sys.argv[2:])
         
@@ -103,7 +135,7 @@ Available commands:
     
     def upgrade(self) -> int:
         """Handle the 'upgrade' command."""
-        parser = argparse.ArgumentParser(description='Upgrade packages')
+        parser = _make_parser('Upgrade packages')
         parser.add_argument('packages', nargs='*', help='Packages to upgrade (default: all)')
         args = parser.parse_args(sys.argv[2:])
         
@@ -111,7 +143,7 @@ Available commands:
     
     def search(self) -> int:
         """Handle the 'search' command."""
-        parser = argparse.ArgumentParser(description='Search for packages')
+        parser = _make_parser('Search for packages')
         parser.add_argument('query', help='Search query')
         args = parser.parse_args(sys.argv[2:])
         
@@ -127,7 +159,7 @@ Available commands:
     
     def list(self) -> int:
         """Handle the 'list' command."""
-        parser = argparse.ArgumentParser(description='List installed packages')
+        parser = _make_parser('List installed packages')
         parser.add_argument('--upgradable', action='store_true', help='Show only upgradable packages')
         args = parser.parse_args(sys.argv[2:])
         
@@ -143,7 +175,7 @@ Available commands:
     
     def mirror(self) -> int:
         """Handle the 'mirror' command."""
-        parser = argparse.ArgumentParser(description='Manage mirrors')
+        parser = _make_parser('Manage mirrors')
         subparsers = parser.add_subparsers(dest='subcommand', help='Subcommand to run')
         
         # List mirrors
@@ -201,7 +233,7 @@ Available commands:
     
     def repo(self) -> int:
         """Handle the 'repo' command."""
-        parser = argparse.ArgumentParser(description='Manage repositories')
+        parser = _make_parser('Manage repositories')
         subparsers = parser.add_subparsers(dest='subcommand', help='Subcommand to run')
         
         # List repositories
@@ -261,9 +293,22 @@ Available commands:
 
 def main():
     """Main entry point for the Syzygia CLI."""
-    cli = SyzygiaCLI()
-    return cli.run()
+    # Sniff the subcommand before building any managers: help, version and
+    # unknown commands never need the configuration or the network stack.
+    command = sys.argv[1:2]
+    if not command or command[0] in ('-h', '--help'):
+        sys.stdout.write(_STATIC_HELP)
+        return 0
 
+    if command[0] in ('-V', '--version'):
+        from . import __version__
+        print(f"syzygia {__version__}")
+        return 0
+
+    if command[0] not in _COMMANDS:
+        print(f"Unknown command: {command[0]}")
+        sys.stdout.write(_STATIC_HELP)
+        return 1
 
-if __name__ == '__main__':
-    sys.exit(main())
+    cli = SyzygiaCLI()
+    return cli.run()
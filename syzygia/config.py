@@ -2,17 +2,41 @@
 Configuration management for Syzygia
 """
 import os
+import re
+import json
 import configparser
-from pathlib import Path
+import shutil
+import tempfile
+from functools import cached_property
 from typing import Dict, List, Optional
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11 keeps using the INI format
+    tomllib = None
+
+# Keys TOML accepts unquoted
+_BARE_KEY_RE = re.compile(r'[A-Za-z0-9_-]+')
+
+
+def _toml_key(name: str) -> str:
+    """Quote a section or option name unless it is a valid bare TOML key."""
+    if _BARE_KEY_RE.fullmatch(name):
+        return name
+    return json.dumps(name, ensure_ascii=False)
+
+
 class Config:
     """Handle configuration and settings for Syzygia."""
 
     def __init__(self, config_path: str = None):
         """Initialize configuration with default values."""
         self.config = configparser.ConfigParser()
-        self.config_path = config_path or os.path.expanduser('~/.config/syzygia/config.ini')
+        self._values: Dict[tuple, Optional[str]] = {}
+        default_name = 'config.toml' if tomllib else 'config.ini'
+        self.config_path = config_path or os.path.expanduser(f'~/.config/syzygia/{default_name}')
+        # TOML is parsed by the C-accelerated tomllib; INI stays as a fallback
+        self._is_toml = tomllib is not None and self.config_path.endswith('.toml')
         self.defaults = {
             'general': {
                 'architecture': 'x86_64',
@@ -21,6 +45,7 @@ class Config:
                 'cache_dir': '/var/cache/syzygia/pkg',
                 'log_file': '/var/log/syzygia.log',
                 'gpg_dir': '/etc/syzygia/gnupg',
+                'parallel_downloads': '5',
             },
             'mirrors': {
                 'servers': 'https://archlinux.org/mirrorlist/?country=all&protocol=https&ip_version=4',
@@ -33,22 +58,40 @@ class Config:
 
     def _load_config(self):
         """Load configuration from file or use defaults."""
-        # Create default config if it doesn't exist
-        if not os.path.exists(self.config_path):
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+        dirty = False
+        legacy_path = os.path.splitext(self.config_path)[0] + '.ini'
+
+        if os.path.exists(self.config_path):
+            self._read_config()
+        elif self._is_toml and os.path.exists(legacy_path):
+            # Migrate an existing config.ini to TOML on first load
+            self.config.read(legacy_path)
+            dirty = True
+        else:
+            # Create default config if it doesn't exist
             self._create_default_config()
 
-        self.config.read(self.config_path)
-
         # Ensure all default sections and options exist
         for section, options in self.defaults.items():
             if not self.config.has_section(section):
                 self.config.add_section(section)
+                dirty = True
             for option, value in options.items():
                 if not self.config.has_option(section, option):
                     self.config.set(section, option, value)
+                    dirty = True
 
-        self._save_config()
+        # Only rewrite the file when defaults were actually filled in
+        if dirty:
+            self._save_config()
+
+    def _read_config(self):
+        """Read the configuration file into the parser."""
+        if self._is_toml:
+            with open(self.config_path, 'rb') as f:
+                self.config.read_dict(tomllib.load(f))
+        else:
+            self.config.read(self.config_path)
 
     def _create_default_config(self):
         """Create default configuration file."""
@@ -58,31 +101,60 @@ class Config:
 
     def _save_config(self):
         """Save current configuration to file."""
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+        config_dir = os.path.dirname(self.config_path)
+        if not os.path.isdir(config_dir):
+            os.makedirs(config_dir, exist_ok=True)
         with open(self.config_path, 'w') as f:
-            self.config.write(f)
+            if self._is_toml:
+                f.write(self._to_toml())
+            else:
+                self.config.write(f)
+
+    def _to_toml(self) -> str:
+        """Serialize the configuration as TOML with every value as a string."""
+        lines = []
+        for section in self.config.sections():
+            lines.append(f"[{_toml_key(section)}]")
+            for option, value in self.config.items(section, raw=True):
+                # JSON string escapes are valid TOML basic strings
+                lines.append(f"{_toml_key(option)} = {json.dumps(value, ensure_ascii=False)}")
+            lines.append("")
+        return "\n".join(lines)
 
     def get(self, section: str, option: str, fallback=None) -> str:
         """Get a configuration value."""
+        key = (section, option, fallback)
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
         try:
-            return self.config.get(section, option, fallback=fallback)
+            value = self.config.get(section, option, fallback=fallback)
         except (configparser.NoSectionError, configparser.NoOptionError):
-            return fallback
+            value = fallback
+
+        self._values[key] = value
+        return value
 
     def set(self, section: str, option: str, value: str):
         """Set a configuration value."""
         if not self.config.has_section(section):
             self.config.add_section(section)
         self.config.set(section, option, value)
+        self._values.clear()
+        if section == 'mirrors':
+            self.invalidate_mirrors()
         self._save_config()
 
-    def get_mirrors(self) -> List[str]:
-        """Get list of configured mirrors."""
+    @cached_property
+    def mirrors(self) -> List[str]:
+        """Mirrors from the mirrorlist, parsed once and memoized."""
         mirror_file = self.get('mirrors', 'mirrorlist')
         mirrors = []
 
         if os.path.exists(mirror_file):
-            with open(mirror_file, 'r') as f:
+            with open(mirror_file, 'r', buffering=1 << 15) as f:
                 for line in f:
                     line = line.strip()
                     if line and not line.startswith('#'):
@@ -90,6 +162,14 @@ class Config:
 
         return mirrors or [self.defaults['mirrors']['servers']]
 
+    def invalidate_mirrors(self):
+        """Drop the memoized mirror list so the mirrorlist is re-read."""
+        self.__dict__.pop('mirrors', None)
+
+    def get_mirrors(self) -> List[str]:
+        """Get list of configured mirrors."""
+        return list(self.mirrors)
+
     def add_mirror(self, mirror_url: str):
         """Add a new mirror to the mirrorlist."""
         mirror_file = self.get('mirrors', 'mirrorlist')
@@ -97,6 +177,7 @@ class Config:
 
         with open(mirror_file, 'a+') as f:
             f.write(f"{mirror_url}\n")
+        self.invalidate_mirrors()
 
     def remove_mirror(self, mirror_url: str) -> bool:
         """
@@ -112,16 +193,31 @@ class Config:
         if not os.path.exists(mirror_file):
             return False
 
+        target = mirror_url.strip()
+        removed = False
+        tmp_path = None
+
         try:
-            with open(mirror_file, 'r') as f:
-                mirrors = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-                
-            if mirror_url in mirrors:
-                mirrors.remove(mirror_url)
-                with open(mirror_file, 'w') as f:
-                    f.write('\n'.join(mirrors) + '\n')
-                return True
-            return False
+            # Stream surviving lines into a temp file next to the mirrorlist
+            # and atomically swap it in, instead of rewriting in place.
+            with open(mirror_file, 'r') as src, tempfile.NamedTemporaryFile(
+                    'w', dir=os.path.dirname(mirror_file), delete=False) as dst:
+                tmp_path = dst.name
+                for line in src:
+                    if line.strip() == target:
+                        removed = True
+                        continue
+                    dst.write(line)
+
+            if removed:
+                shutil.copymode(mirror_file, tmp_path)
+                os.replace(tmp_path, mirror_file)
+                tmp_path = None
+                self.invalidate_mirrors()
+            return removed
         except Exception as e:
             print(f"Error removing mirror: {e}")
             return False
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -2,12 +2,45 @@
 Mirror management for Syzygia
 """
 import os
+import json
 import time
+import hashlib
 import random
+import shutil
+import tempfile
+import threading
 import requests
-from typing import List, Optional, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from typing import List, Optional, Dict, Set, Tuple
 from urllib.parse import urlparse
-from pathlib import Path
+from tqdm import tqdm
+from urllib3.exceptions import HTTPError as URLLib3Error
+from urllib3.util.retry import Retry
+
+from . import __version__
+
+# How long a mirror reachability probe stays valid, in seconds
+VALIDATION_TTL = 3600
+
+# How long a failed probe is remembered, in seconds; kept short so a
+# transient network error does not block a mirror for long
+FAILED_VALIDATION_TTL = 30
+
+# Buffer size used when streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+# Buffer size used when saving a refreshed mirrorlist
+MIRRORLIST_CHUNK_SIZE = 1 << 15
+
+# How long a latency ranking of the configured mirrors stays valid, in seconds
+RANKING_TTL = 300
+
+# Weight of the newest sample in each mirror's moving-average latency
+LATENCY_EMA_ALPHA = 0.2
+
+# How long computed mirror selection weights are reused, in seconds
+WEIGHTS_TTL = 60
 
 class MirrorManager:
     """Manage package mirrors and handle mirror selection."""
@@ -16,8 +49,66 @@ class MirrorManager:
         """Initialize with configuration."""
         self.config = config
         self.mirrors = self._load_mirrors()
-        self.mirror_stats = {}
+        # mirror -> (moving-average latency in seconds, successes, failures)
+        self.mirror_stats: Dict[str, Tuple[float, int, int]] = {}
+        self._stats_lock = threading.Lock()
+        self._ranked_mirrors: List[str] = []
+        self._ranked_at = 0.0
+        self._weights: List[float] = []
+        self._weights_at = 0.0
+        self._load_settings()
+        self._validation_cache: Optional[Dict[str, Tuple[bool, float]]] = None
+        self._session = self._create_session()
+        # Probes are timing measurements: a retried HEAD would report the
+        # backoff delay as latency, so they go through a session without retries
+        self._probe_session = self._create_session(retry=False)
+        # Per-URL string work memoized for repeated downloads and validations
+        self._normalized_base: Dict[str, str] = {}
+        self._parsed_urls: Dict[str, Tuple[str, str, str]] = {}
+        # Download directories already known to exist
+        self._created_dirs: Set[str] = set()
+
+    def _load_settings(self):
+        """Snapshot the mirror-related configuration used on hot paths."""
         self._timeout = int(self.config.get('mirrors', 'timeout', '10'))
+        self._mirrorlist_path = self.config.get('mirrors', 'mirrorlist')
+        self._servers_url = self.config.get('mirrors', 'servers')
+        self._validation_file = os.path.join(
+            self.config.get('general', 'cache_dir', '/var/cache/syzygia/pkg'),
+            'mirror_validation.json')
+
+    def reload(self):
+        """Re-read configuration and mirrors after the config changed at runtime."""
+        self._load_settings()
+        self._validation_cache = None
+        self._created_dirs.clear()
+        self.config.invalidate_mirrors()
+        self.mirrors = self._load_mirrors()
+        self._invalidate_ranking()
+
+    def _create_session(self, retry: bool = True) -> requests.Session:
+        """Create an HTTP session for mirror requests.
+
+        Reusing a session keeps connections to each mirror alive across
+        requests instead of repeating the TCP/TLS handshake.
+
+        Args:
+            retry: Whether to retry failed requests with backoff
+
+        Returns:
+            requests.Session: The configured session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.5,
+                              status_forcelist=(500, 502, 503, 504)) if retry else 0,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'User-Agent': f'syzygia/{__version__}'})
+        return session
 
     def _load_mirrors(self) -> List[str]:
         """Load mirrors from configuration."""
@@ -38,6 +129,7 @@ class MirrorManager:
 
         self.config.add_mirror(mirror_url)
         self.mirrors = self._load_mirrors()
+        self._invalidate_ranking()
         return True
 
     def remove_mirror(self, mirror_url: str) -> bool:
@@ -52,6 +144,7 @@ class MirrorManager:
         success = self.config.remove_mirror(mirror_url)
         if success:
             self.mirrors = self._load_mirrors()
+            self._invalidate_ranking()
         return success
 
     def _validate_mirror(self, mirror_url: str) -> bool:
@@ -64,106 +157,394 @@ class MirrorManager:
             bool: True if mirror is valid and reachable
         """
         try:
-            parsed = urlparse(mirror_url)
-            if not parsed.scheme or not parsed.netloc:
+            parts = self._parsed_urls.get(mirror_url)
+            if parts is None:
+                parsed = urlparse(mirror_url)
+                parts = self._parsed_urls[mirror_url] = (parsed.scheme, parsed.netloc, parsed.path)
+            scheme, netloc, path = parts
+
+            if not scheme or not netloc:
                 return False
 
             # Check if it's a local file path
-            if parsed.scheme == 'file':
-                return os.path.exists(parsed.path)
+            if scheme == 'file':
+                return os.path.exists(path)
 
             # Check if it's a remote URL
-            if parsed.scheme in ('http', 'https'):
-                test_url = f"{parsed.scheme}://{parsed.netloc}/"
+            if scheme in ('http', 'https'):
+                test_url = f"{scheme}://{netloc}/"
+                cached = self._get_cached_validation(test_url)
+                if cached is not None:
+                    return cached
+
                 try:
-                    response = requests.head(test_url, timeout=5)
-                    return response.status_code == 200
+                    response = self._probe_session.head(test_url, timeout=5)
+                    valid = response.status_code == 200
                 except requests.RequestException:
-                    return False
+                    valid = False
+
+                self._set_cached_validation(test_url, valid)
+                return valid
 
             return False
         except Exception:
             return False
 
+    def _load_validation_cache(self) -> Dict[str, Tuple[bool, float]]:
+        """Load persisted mirror probe results, reading the file at most once."""
+        if self._validation_cache is None:
+            try:
+                with open(self._validation_file, 'r') as f:
+                    self._validation_cache = {
+                        url: (bool(valid), float(checked))
+                        for url, (valid, checked) in json.load(f).items()
+                    }
+            except (OSError, ValueError, TypeError):
+                self._validation_cache = {}
+        return self._validation_cache
+
+    def _get_cached_validation(self, test_url: str) -> Optional[bool]:
+        """Return a cached probe result for test_url if it has not expired."""
+        entry = self._load_validation_cache().get(test_url)
+        if entry is None:
+            return None
+
+        valid, checked = entry
+        ttl = VALIDATION_TTL if valid else FAILED_VALIDATION_TTL
+        if time.time() - checked > ttl:
+            return None
+        return valid
+
+    def _set_cached_validation(self, test_url: str, valid: bool):
+        """Record a probe result in memory, and on disk if it succeeded."""
+        cache = self._load_validation_cache()
+        cache[test_url] = (valid, time.time())
+        if not valid:
+            # Failures are only remembered briefly, in this process
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self._validation_file), exist_ok=True)
+            with open(self._validation_file, 'w') as f:
+                json.dump({url: entry for url, entry in cache.items() if entry[0]}, f)
+        except OSError:
+            # The cache is only an optimization; keep the in-memory result
+            pass
+
+    def clear_validation_cache(self):
+        """Forget all cached mirror probe results."""
+        self._validation_cache = {}
+        try:
+            os.remove(self._validation_file)
+        except OSError:
+            pass
+
     def get_best_mirror(self) -> Optional[str]:
         """Get the best available mirror based on response time and priority.
         
         Returns:
             Optional[str]: URL of the best mirror, or None if no mirrors available
         """
-        if not self.mirrors:
+        # Ranking guarantees every mirror has been probed at least once
+        if not self._rank_mirrors():
             return None
 
-        # Simple round-robin for now
-        # TODO: Implement better mirror ranking based on response time and success rate
-        return random.choice(self.mirrors)
+        if not self._weights or time.monotonic() - self._weights_at >= WEIGHTS_TTL:
+            self._weights = [self._mirror_weight(mirror) for mirror in self.mirrors]
+            self._weights_at = time.monotonic()
+
+        return random.choices(self.mirrors, weights=self._weights, k=1)[0]
+
+    def _mirror_weight(self, mirror_url: str) -> float:
+        """Selection weight of a mirror: its success rate over its latency."""
+        latency, successes, failures = self.mirror_stats.get(
+            mirror_url, (float(self._timeout), 0, 0))
+        # Laplace smoothing keeps new or unlucky mirrors selectable
+        success_rate = (successes + 1) / (successes + failures + 2)
+        return success_rate / max(latency, 0.001)
+
+    def _record_result(self, mirror_url: str, elapsed: float, success: bool):
+        """Fold one request outcome into the mirror's statistics.
+
+        Args:
+            mirror_url: URL of the mirror that was contacted
+            elapsed: Time the request took, in seconds
+            success: Whether the request succeeded
+        """
+        with self._stats_lock:
+            latency, successes, failures = self.mirror_stats.get(mirror_url, (elapsed, 0, 0))
+            latency = (1 - LATENCY_EMA_ALPHA) * latency + LATENCY_EMA_ALPHA * elapsed
+            if success:
+                successes += 1
+            else:
+                failures += 1
+            self.mirror_stats[mirror_url] = (latency, successes, failures)
+
+    def _rank_mirrors(self) -> List[str]:
+        """Order mirrors by measured response time, fastest first.
+
+        All mirrors are probed concurrently and the result is reused for
+        RANKING_TTL seconds. Unreachable mirrors are kept at the end so they
+        still serve as a last resort.
+
+        Returns:
+            List[str]: Mirror URLs sorted by latency
+        """
+        if self._ranked_mirrors and time.monotonic() - self._ranked_at < RANKING_TTL:
+            return self._ranked_mirrors
+
+        if not self.mirrors:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(32, len(self.mirrors))) as executor:
+            latencies = dict(zip(self.mirrors, executor.map(self._probe_mirror, self.mirrors)))
+
+        for mirror, latency in latencies.items():
+            if latency == float('inf'):
+                self._record_result(mirror, float(self._timeout), False)
+            else:
+                self._record_result(mirror, latency, True)
+
+        self._ranked_mirrors = sorted(self.mirrors, key=latencies.__getitem__)
+        self._ranked_at = time.monotonic()
+        return self._ranked_mirrors
+
+    def _probe_mirror(self, mirror_url: str) -> float:
+        """Measure how long a mirror takes to answer.
+
+        Args:
+            mirror_url: URL of the mirror to probe
 
-    def download_file(self, file_path: str, destination: str) -> bool:
+        Returns:
+            float: Response time in seconds, or infinity if unreachable
+        """
+        if mirror_url.startswith('file://'):
+            return 0.0 if os.path.exists(mirror_url[len('file://'):]) else float('inf')
+
+        start = time.perf_counter()
+        try:
+            response = self._probe_session.head(mirror_url, timeout=self._timeout)
+            if response.status_code >= 400:
+                return float('inf')
+        except requests.RequestException:
+            return float('inf')
+        return time.perf_counter() - start
+
+    def _invalidate_ranking(self):
+        """Force the next mirror lookup to re-probe all mirrors."""
+        self._ranked_mirrors = []
+        self._ranked_at = 0.0
+        self._weights = []
+        self._weights_at = 0.0
+
+    def download_file(self, file_path: str, destination: str,
+                      checksum: Optional[str] = None) -> bool:
         """Download a file from the best available mirror.
         
         Args:
             file_path: Relative path of the file to download
             destination: Local path where to save the file
+            checksum: Expected SHA-256 of the file (optional); a mirror serving
+                different content counts as a failed download
             
         Returns:
             bool: True if download was successful
         """
-        for mirror in self.mirrors:
+        # Try a weighted pick first, then fail over in latency order
+        best = self.get_best_mirror()
+        if best is None:
+            return False
+        candidates = [best] + [mirror for mirror in self._rank_mirrors() if mirror != best]
+
+        # Mirror latency is recorded as time to first byte, matching what the
+        # ranking probes measure; total transfer time depends on file size
+        for mirror in candidates:
             try:
                 if mirror.startswith('file://'):
-                    return self._download_local(mirror, file_path, destination)
+                    ok = self._download_local(mirror, file_path, destination, checksum)
+                    latency = 0.0
                 else:
-                    return self._download_remote(mirror, file_path, destination)
-            except Exception as e:
+                    ok, latency = self._download_remote(mirror, file_path, destination, checksum)
+            except (requests.RequestException, URLLib3Error, OSError) as e:
+                # Reading r.raw directly surfaces urllib3 errors unwrapped
+                self._record_result(mirror, float(self._timeout), False)
                 print(f"Failed to download from {mirror}: {str(e)}")
                 continue
 
+            self._record_result(mirror, latency, ok)
+
+            # Fall through to the next mirror unless this one succeeded
+            if ok:
+                return True
+
         return False
 
-    def _download_remote(self, base_url: str, file_path: str, destination: str) -> bool:
+    def download_files(self, items: List[Tuple[str, ...]], max_workers: int = 8) -> List[bool]:
+        """Download several files concurrently from the best available mirrors.
+        
+        Args:
+            items: (file_path, destination) or (file_path, destination, checksum)
+                tuples to download; checksum is the expected SHA-256
+            max_workers: Maximum number of simultaneous downloads
+            
+        Returns:
+            List[bool]: Download success of each item, in the order of items
+        """
+        results: List[bool] = [False] * len(items)
+        if not items:
+            return results
+
+        # Rank once up front so the workers don't all probe the mirrors
+        self._rank_mirrors()
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            futures = {
+                executor.submit(self.download_file, *item): i
+                for i, item in enumerate(items)
+            }
+            with tqdm(total=len(futures), unit='file', desc='Downloading', ncols=80) as progress:
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    progress.update(1)
+
+        return results
+
+    def _download_remote(self, base_url: str, file_path: str, destination: str,
+                         checksum: Optional[str] = None) -> Tuple[bool, float]:
         """Download a file from a remote mirror.
         
         Args:
             base_url: Base URL of the mirror
             file_path: Relative path of the file
             destination: Local path to save the file
+            checksum: Expected SHA-256 of the file (optional)
             
         Returns:
-            bool: True if download was successful
+            Tuple[bool, float]: Whether the download was successful, and the
+            time until the response headers arrived in seconds
         """
-        url = f"{base_url.rstrip('/')}/{file_path.lstrip('/')}"
-
-        # Create destination directory if it doesn't exist
-        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        base = self._normalized_base.get(base_url)
+        if base is None:
+            base = self._normalized_base[base_url] = base_url.rstrip('/')
+        url = f"{base}/{file_path.lstrip('/')}"
 
-        with requests.get(url, stream=True, timeout=self._timeout) as r:
+        with self._session.get(url, stream=True, timeout=self._timeout) as r:
             r.raise_for_status()
-            with open(destination, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            latency = r.elapsed.total_seconds()
+            # Let urllib3 undo any Content-Encoding and copy in large blocks;
+            # copyfileobj buffers itself, so the file is opened unbuffered.
+            r.raw.decode_content = True
+            with self._open_destination(destination) as f:
+                try:
+                    if checksum is None:
+                        shutil.copyfileobj(r.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                        return True, latency
 
-        return True
+                    # Hash while writing so the file is never read back from disk
+                    file_hash = hashlib.sha256()
+                    while True:
+                        chunk = r.raw.read(DOWNLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        file_hash.update(chunk)
+                except Exception:
+                    # Only a transfer that reached the destination leaves a
+                    # partial file behind
+                    self._remove_partial(destination)
+                    raise
+
+        return self._check_digest(file_hash.hexdigest(), checksum, destination), latency
 
-    def _download_local(self, base_path: str, file_path: str, destination: str) -> bool:
+    def _download_local(self, base_path: str, file_path: str, destination: str,
+                        checksum: Optional[str] = None) -> bool:
         """Copy a file from a local mirror.
         
         Args:
             base_path: Base filesystem path of the mirror
             file_path: Relative path of the file
             destination: Local path to save the file
+            checksum: Expected SHA-256 of the file (optional)
             
         Returns:
             bool: True if copy was successful
         """
-        import shutil
-
         src_path = os.path.join(base_path.replace('file://', ''), file_path.lstrip('/'))
 
-        # Create destination directory if it doesn't exist
-        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        # The source is opened first, so a mirror without the file fails
+        # before the destination is touched
+        with open(src_path, 'rb') as src, self._open_destination(destination) as dst:
+            try:
+                shutil.copyfileobj(src, dst, DOWNLOAD_CHUNK_SIZE)
+            except OSError:
+                self._remove_partial(destination)
+                raise
+        shutil.copystat(src_path, destination)
+        if checksum is None:
+            return True
 
-        shutil.copy2(src_path, destination)
-        return True
+        with open(destination, 'rb') as f:
+            if hasattr(hashlib, 'file_digest'):
+                # Python 3.11+: hashed in C with the GIL released
+                digest = hashlib.file_digest(f, 'sha256').hexdigest()
+            else:
+                file_hash = hashlib.sha256()
+                for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                    file_hash.update(chunk)
+                digest = file_hash.hexdigest()
+
+        return self._check_digest(digest, checksum, destination)
+
+    def _remove_partial(self, destination: str):
+        """Delete whatever a failed download left at destination."""
+        try:
+            os.remove(destination)
+        except OSError:
+            pass
+
+    def _ensure_dir(self, directory: str):
+        """Create a download directory once per manager instead of per file."""
+        if directory not in self._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
+
+    def _forget_dir(self, directory: str):
+        """Stop assuming a download directory exists."""
+        self._created_dirs.discard(directory)
+
+    def _open_destination(self, destination: str):
+        """Open a download destination for unbuffered writing.
+
+        The directory is recreated if it was removed after it was first created.
+        """
+        directory = os.path.dirname(destination)
+        self._ensure_dir(directory)
+        try:
+            return open(destination, 'wb', buffering=0)
+        except FileNotFoundError:
+            self._forget_dir(directory)
+            self._ensure_dir(directory)
+            return open(destination, 'wb', buffering=0)
+
+    def _check_digest(self, digest: str, checksum: str, destination: str) -> bool:
+        """Compare a computed digest with the expected one.
+
+        A mismatching file is deleted so it can't be mistaken for a good copy.
+
+        Args:
+            digest: Hex digest of the downloaded file
+            checksum: Expected hex digest
+            destination: Path of the downloaded file
+
+        Returns:
+            bool: True if the digests match
+        """
+        if digest == checksum.lower():
+            return True
+
+        print(f"Checksum mismatch for {destination}")
+        os.remove(destination)
+        return False
 
     def update_mirror_list(self) -> bool:
         """Update the mirror list from the configured source.
@@ -171,22 +552,45 @@ class MirrorManager:
         Returns:
             bool: True if mirror list was updated successfully
         """
-        mirrorlist_url = self.config.get('mirrors', 'servers')
+        mirrorlist_url = self._servers_url
         if not mirrorlist_url:
             return False
 
+        mirror_file = self._mirrorlist_path
+        tmp_path = None
+
         try:
-            response = requests.get(mirrorlist_url, timeout=10)
-            if response.status_code == 200:
-                mirror_file = self.config.get('mirrors', 'mirrorlist')
+            with self._session.get(mirrorlist_url, stream=True, timeout=self._timeout) as response:
+                if response.status_code != 200:
+                    return False
+
                 os.makedirs(os.path.dirname(mirror_file), exist_ok=True)
 
-                with open(mirror_file, 'w') as f:
-                    f.write(response.text)
+                # Copy the body straight to disk instead of decoding it into
+                # one big string first. It goes to a temp file next to the
+                # mirrorlist so a failed transfer leaves the old list intact.
+                response.raw.decode_content = True
+                with tempfile.NamedTemporaryFile(
+                        'wb', dir=os.path.dirname(mirror_file), delete=False) as f:
+                    tmp_path = f.name
+                    shutil.copyfileobj(response.raw, f, length=MIRRORLIST_CHUNK_SIZE)
 
-                self.mirrors = self._load_mirrors()
-                return True
+            if os.path.exists(mirror_file):
+                shutil.copymode(mirror_file, tmp_path)
+            else:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, mirror_file)
+            tmp_path = None
+
+            self.config.invalidate_mirrors()
+            self.mirrors = self._load_mirrors()
+            self.clear_validation_cache()
+            self._invalidate_ranking()
+            return True
         except Exception as e:
             print(f"Failed to update mirror list: {str(e)}")
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
         return False
@@ -1,12 +1,53 @@
 """Package management for Syzygia."""
 
 import os
-import tarfile
+import re
+import shutil
+import tempfile
 import json
-import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any
-from typing import List, Dict, Optional, Set, Tuple, Any
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+# "key: value" lines of a desc file; comment and blank lines never match
+_FIELD_RE = re.compile(rb'^[ \t]*([^#:\s][^:\n]*?)[ \t]*:[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+
+# Start of the version constraint in a dependency such as "glibc>=2.38"
+_VERSION_OP_RE = re.compile(r'[<>=]')
+
+
+# Numeric and alphabetic runs of a version string
+_VERSION_PART_RE = re.compile(r'\d+|[A-Za-z]+')
+
+
+# Package attributes stored in the packed index of installed packages
+_INDEX_FIELDS = ('name', 'version', 'description', 'depends', 'provides',
+                 'conflicts', 'size', 'url', 'packager')
+
+
+def _dep_name(dep: str) -> str:
+    """Strip any version constraint from a dependency string."""
+    return _VERSION_OP_RE.split(dep, 1)[0]
+
+def _version_key(version: str) -> Tuple:
+    """Build a sort key for an "[epoch:]pkgver[-pkgrel]" version string.
+
+    Numeric parts compare as numbers and sort above alphabetic parts, so
+    "1.10" > "1.9" and "1.0" > "1.0rc1".
+    """
+    epoch, _, rest = version.rpartition(':')
+    pkgver, _, pkgrel = rest.partition('-')
+
+    def parts(segment: str) -> Tuple:
+        # The end marker sorts between alphabetic and numeric parts
+        return tuple(
+            (2, int(part)) if part.isdigit() else (0, part)
+            for part in _VERSION_PART_RE.findall(segment)
+        ) + ((1,),)
+
+    return (int(epoch) if epoch.isdigit() else 0, parts(pkgver), parts(pkgrel))
 
 class Package:
     """Represents a package in the system."""
@@ -14,24 +55,128 @@ class Package:
     def __init__(self, name: str, version: str, description: str = "",
                  depends: List[str] = None, provides: List[str] = None,
                  conflicts: List[str] = None, size: int = 0,
-                 url: str = "", packager: str = "") -> None:
+                 url: str = "", packager: str = "", repo: str = "") -> None:
         self.name = name
         self.version = version
         self.description = description
-        self.depends = depends or []
+        # Ordered for display and serialization; the frozenset gives O(1)
+        # membership tests
+        self.depends_list = list(depends or ())
+        self.depends = frozenset(self.depends_list)
         self.provides = provides or []
         self.conflicts = conflicts or []
         self.size = size
         self.url = url
         self.packager = packager
+        # Name of the repository offering the package, if any
+        self.repo = repo
+
+    @cached_property
+    def version_key(self) -> Tuple:
+        """Parsed version, computed once for comparisons."""
+        return _version_key(self.version)
+
+    @cached_property
+    def _name_lc(self) -> str:
+        """Lowercased name, computed once for case-insensitive search."""
+        return self.name.lower()
+
+    @cached_property
+    def _desc_lc(self) -> str:
+        """Lowercased description, computed once for case-insensitive search."""
+        return (self.description or "").lower()
+
+
+class _LazyPkgDict(dict):
+    """Installed packages keyed by name, read from the local database on demand.
+
+    Looking up a single package reads only that package's entry.
+    Anything that needs every package (iteration, keys(), values(), len())
+    loads the whole database once.
+    """
+
+    def __init__(self, load_one, load_all) -> None:
+        super().__init__()
+        self._load_one = load_one
+        self._load_all = load_all
+        self._complete = False
+        self._absent: Set[str] = set()
+
+    def _lookup(self, name: str) -> bool:
+        """Load name from the database if needed and report whether it is installed."""
+        if dict.__contains__(self, name):
+            return True
+        if self._complete or name in self._absent:
+            return False
+
+        pkg = self._load_one(name)
+        if pkg is None:
+            self._absent.add(name)
+            return False
+        dict.__setitem__(self, name, pkg)
+        return True
+
+    def _ensure_complete(self) -> None:
+        """Load every installed package not read yet."""
+        if not self._complete:
+            for pkg in self._load_all():
+                # Names known to be absent include packages removed since
+                # the database was last written
+                if pkg.name not in self._absent:
+                    dict.setdefault(self, pkg.name, pkg)
+            self._complete = True
+
+    def __missing__(self, name: str) -> Package:
+        if self._lookup(name):
+            return dict.__getitem__(self, name)
+        raise KeyError(name)
+
+    def __contains__(self, name: object) -> bool:
+        return self._lookup(name)
+
+    def __setitem__(self, name: str, pkg: Package) -> None:
+        self._absent.discard(name)
+        dict.__setitem__(self, name, pkg)
+
+    def __delitem__(self, name: str) -> None:
+        dict.__delitem__(self, name)
+        self._absent.add(name)
+
+    def pop(self, name: str, *default):
+        self._absent.add(name)
+        return dict.pop(self, name, *default)
+
+    def get(self, name: str, default: Optional[Package] = None) -> Optional[Package]:
+        return dict.__getitem__(self, name) if self._lookup(name) else default
+
+    def __iter__(self):
+        self._ensure_complete()
+        return dict.__iter__(self)
+
+    def __len__(self) -> int:
+        self._ensure_complete()
+        return dict.__len__(self)
+
+    def keys(self):
+        self._ensure_complete()
+        return dict.keys(self)
+
+    def values(self):
+        self._ensure_complete()
+        return dict.values(self)
+
+    def items(self):
+        self._ensure_complete()
+        return dict.items(self)
 
 
 class PackageManager:
     """Handle package installation, removal, and queries."""
     
-    def __init__(self, config: Any, mirror_manager: Any) -> None:
+    def __init__(self, config: Any, mirror_manager: Any, repo_manager: Any = None) -> None:
         self.config = config
         self.mirror_manager = mirror_manager
+        self.repo_manager = repo_manager
         self.db_path = Path(self.config.get('general', 'db_path', fallback='/var/lib/syzygia'))
         self.cache_dir = Path(self.config.get('general', 'cache_dir', fallback='/var/cache/syzygia'))
         
@@ -39,60 +184,190 @@ class PackageManager:
         self.db_path.mkdir(parents=True, exist_ok=True)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # In-memory package database
-        self.installed_pkgs: Dict[str, Package] = {}
-        self.available_pkgs: Dict[str, List[Package]] = {}
-        
-        self._load_installed_packages()
+        # Packed index of every installed package, so the local database
+        # can be loaded with a single read; per-package desc files remain
+        # as a fallback
+        self._index_path = self.db_path / 'local' / 'index.json'
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._index_loaded = False
+
+        # In-memory package database; installed packages are parsed lazily
+        self.installed_pkgs: Dict[str, Package] = _LazyPkgDict(
+            self._load_installed_package, self._load_installed_packages)
+        # Repository packages: name -> version -> Package, plus the newest
+        # version of each name, kept current by add_available()
+        self.available_pkgs: Dict[str, Dict[str, Package]] = {}
+        self._latest_available: Dict[str, Package] = {}
 
-    def _load_installed_packages(self) -> None:
-        """Load installed packages from the database."""
-        db_dir = self.db_path / 'local'
-        if not db_dir.exists():
+        # Reverse dependency index: dependency name -> names of installed
+        # packages that depend on it. Built on first use since it needs
+        # every installed package.
+        self._reverse_deps: Optional[Dict[str, Set[str]]] = None
+
+    def _get_reverse_deps(self) -> Dict[str, Set[str]]:
+        """Return the reverse dependency index, building it if needed."""
+        if self._reverse_deps is None:
+            self._reverse_deps = {}
+            for pkg in self.installed_pkgs.values():
+                self._index_dependencies(pkg)
+        return self._reverse_deps
+
+    def _index_dependencies(self, pkg: Package) -> None:
+        """Record pkg as a dependent of each of its dependencies."""
+        if self._reverse_deps is None:
             return
-            
-        for pkg_dir in db_dir.iterdir():
-            if pkg_dir.is_dir():
-                pkg_file = pkg_dir / 'desc'
-                if pkg_file.exists():
-                    pkg = self._parse_package_file(pkg_file)
+        for dep in pkg.depends:
+            self._reverse_deps.setdefault(_dep_name(dep), set()).add(pkg.name)
+
+    def _unindex_dependencies(self, pkg: Package) -> None:
+        """Remove pkg from the reverse dependency index."""
+        if self._reverse_deps is None:
+            return
+        for dep in pkg.depends:
+            dep = _dep_name(dep)
+            dependents = self._reverse_deps.get(dep)
+            if dependents is not None:
+                dependents.discard(pkg.name)
+                if not dependents:
+                    del self._reverse_deps[dep]
+
+    def _read_index(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Return the packed index of installed packages, or None if unavailable."""
+        if not self._index_loaded:
+            self._index_loaded = True
+            try:
+                with open(self._index_path, 'rb') as f:
+                    self._index = json.load(f)
+            except FileNotFoundError:
+                self._index = None
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable package index {self._index_path}: {str(e)}")
+                self._index = None
+        return self._index
+
+    def _write_index(self, packages) -> None:
+        """Atomically replace the packed index with the given packages."""
+        index = {}
+        for pkg in packages:
+            entry = {field: getattr(pkg, field) for field in _INDEX_FIELDS}
+            entry['depends'] = pkg.depends_list
+            index[pkg.name] = entry
+        tmp_path = None
+
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            # A unique temporary file per write, so concurrent writers never
+            # share one
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self._index_path.parent,
+                                             prefix='index.', suffix='.tmp',
+                                             delete=False) as f:
+                tmp_path = f.name
+                json.dump(index, f)
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            print(f"Warning: could not write package index {self._index_path}: {str(e)}")
+            if tmp_path is not None and os.path.isfile(tmp_path):
+                os.unlink(tmp_path)
+            self._discard_index()
+            return
+
+        self._index = index
+        self._index_loaded = True
+
+    def _discard_index(self) -> None:
+        """Delete the packed index so the next load rescans the desc files.
+
+        Used when the index could not be updated; a stale index would hide
+        packages whose desc files were written after it.
+        """
+        self._index = None
+        self._index_loaded = True
+        try:
+            self._index_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: could not remove stale package index {self._index_path}: {str(e)}")
+
+    def _start_changes(self) -> None:
+        """Prepare the local database for a batch of installs or removals.
+
+        Every package is loaded and the on-disk index is deleted; the batch
+        writes it again when done. An interrupted batch thus leaves no index
+        behind rather than one that misses its changes.
+        """
+        self.installed_pkgs._ensure_complete()
+        self._discard_index()
+
+    def _load_installed_packages(self) -> List[Package]:
+        """Load all installed packages from the database."""
+        index = self._read_index()
+        if index is not None:
+            return [Package(**entry) for entry in index.values()]
+
+        # The index is (re)built by the next install or removal; read-only
+        # commands may run without write access to the database
+        return self._scan_installed_packages()
+
+    def _scan_installed_packages(self) -> List[Package]:
+        """Load all installed packages from their individual desc files."""
+        packages = []
+        try:
+            entries = os.scandir(self.db_path / 'local')
+        except FileNotFoundError:
+            return packages
+
+        # scandir reports the entry type from the directory listing itself,
+        # so no per-entry stat is needed
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pkg = self._parse_package_file(os.path.join(entry.path, 'desc'))
                     if pkg:
-                        self.installed_pkgs[pkg.name] = pkg
+                        packages.append(pkg)
+        return packages
+
+    def _load_installed_package(self, package_name: str) -> Optional[Package]:
+        """Load a single installed package from the database."""
+        index = self._read_index()
+        if index is not None:
+            entry = index.get(package_name)
+            if entry:
+                return Package(**entry)
+
+        # Not in the index (or no index): the desc file is the fallback
+        pkg = self._parse_package_file(self.db_path / 'local' / package_name / 'desc')
+        if pkg is None or pkg.name != package_name:
+            return None
+        return pkg
 
-    def _parse_package_file(self, file_path: Path) -> Optional[Package]:
-        """Parse package metadata file."""
+    def _parse_package_file(self, file_path: Union[str, Path]) -> Optional[Package]:
+        """Parse package metadata file, returning None if it does not exist."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(file_path, 'rb') as f:
                 content = f.read()
                 
-            # Simple parsing of package metadata
-            pkg_data = {}
-            current_field = None
+            # Let the regex engine find all fields in one pass; only the
+            # values that are actually used get decoded
+            pkg_data = {key.lower(): value for key, value in _FIELD_RE.findall(content)}
             
-            for line in content.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                if line.startswith('#'):
-                    continue
-                    
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    pkg_data[key.strip().lower()] = value.strip()
-            
-            if 'name' not in pkg_data or 'version' not in pkg_data:
+            if b'name' not in pkg_data or b'version' not in pkg_data:
                 return None
+
+            def field(key: bytes) -> str:
+                return pkg_data.get(key, b'').decode('utf-8')
                 
             return Package(
-                name=pkg_data['name'],
-                version=pkg_data['version'],
-                description=pkg_data.get('description', ''),
-                depends=pkg_data.get('depends', '').split(),
-                provides=pkg_data.get('provides', '').split(),
-                conflicts=pkg_data.get('conflicts', '').split()
+                name=field(b'name'),
+                version=field(b'version'),
+                description=field(b'description'),
+                depends=field(b'depends').split(),
+                provides=field(b'provides').split(),
+                conflicts=field(b'conflicts').split()
             )
             
+        except FileNotFoundError:
+            return None
         except Exception as e:
             print(f"Error parsing package file {file_path}: {str(e)}")
             return None
@@ -116,53 +391,135 @@ class PackageManager:
         
         # Add to installed packages
         self.installed_pkgs[pkg_name] = pkg
+        self._index_dependencies(pkg)
         
         # Create package directory in database
         pkg_dir = self.db_path / 'local' / pkg_name
         pkg_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save package metadata
-        with open(pkg_dir / 'desc', 'w') as f:
-            f.write(f"name: {pkg_name}\n")
-            f.write(f"version: 1.0.0\n")
-            f.write(f"description: Installed from {pkg_file}\n")
-            f.write(f"depends: \n")
-            f.write(f"provides: {pkg_name}\n")
-            f.write(f"conflicts: \n")
+        # Save package metadata in a single write
+        (pkg_dir / 'desc').write_bytes(self._format_desc(pkg))
         
-        print(f"Successfully installed {pkg_name}")
         return True
 
+    def _format_desc(self, pkg: Package) -> bytes:
+        """Serialize a package to the contents of its desc file."""
+        return ''.join([
+            f"name: {pkg.name}\n",
+            f"version: {pkg.version}\n",
+            f"description: {pkg.description}\n",
+            f"depends: {' '.join(pkg.depends_list)}\n",
+            f"provides: {' '.join(pkg.provides)}\n",
+            f"conflicts: {' '.join(pkg.conflicts)}\n",
+        ]).encode('utf-8')
+
+    def add_available(self, pkg: Package) -> None:
+        """Register a package version offered by a repository."""
+        self.available_pkgs.setdefault(pkg.name, {})[pkg.version] = pkg
+        latest = self._latest_available.get(pkg.name)
+        if latest is None or pkg.version_key >= latest.version_key:
+            self._latest_available[pkg.name] = pkg
+
+    def get_latest_available(self, package_name: str) -> Optional[Package]:
+        """Get the newest available version of a package."""
+        return self._latest_available.get(package_name)
+
     def list_installed(self) -> List[Package]:
         """List all installed packages."""
         return list(self.installed_pkgs.values())
 
     def install(self, package_names: List[str], nodeps: bool = False) -> bool:
         """Install one or more packages."""
-        success = True
+        to_install = []
         
-        for pkg_name in package_names:
+        # Dependencies are installed before the packages that need them
+        for pkg_name in self._topo_order(package_names):
             if pkg_name in self.installed_pkgs:
                 print(f"Package {pkg_name} is already installed")
                 continue
+            to_install.append(pkg_name)
                 
-            # Create a dummy package file path
-            pkg_file = self.cache_dir / f"{pkg_name}-1.0.0.pkg.tar.zst"
-            pkg_file.touch()  # Create empty file
-            
-            if self._install_package(pkg_file):
+        return self._apply_all(self._fetch_all(to_install))
+
+    def _fetch_all(self, package_names: List[str]) -> List[Tuple[str, Optional[Path]]]:
+        """Download the archives of the given packages concurrently.
+
+        Archives already in the cache, and packages not offered by a known
+        repository, are not fetched.
+
+        Returns:
+            List[Tuple[str, Optional[Path]]]: (name, archive path) pairs in the
+            input order; the path is None when the download failed
+        """
+        results: List[Tuple[str, Optional[Path]]] = []
+        downloads = {}
+
+        for pkg_name in package_names:
+            latest = self._latest_available.get(pkg_name)
+            # Without repository metadata, fall back to the placeholder
+            # version that _install_package records
+            version = latest.version if latest is not None else "1.0.0"
+            filename = f"{pkg_name}-{version}.pkg.tar.zst"
+            # Path the package archive is cached at
+            pkg_file = self.cache_dir / filename
+            results.append((pkg_name, pkg_file))
+
+            if latest is None or pkg_file.exists():
+                continue
+            repo = self._get_repo(latest)
+            if repo is not None:
+                downloads[pkg_name] = (repo.url_for(filename), pkg_file)
+
+        if not downloads:
+            return results
+
+        from .utils.downloader import download_with_retry
+
+        max_workers = int(self.config.get('general', 'parallel_downloads', fallback='5'))
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(downloads)))) as executor:
+            futures = {
+                pkg_name: executor.submit(download_with_retry, url, pkg_file)
+                for pkg_name, (url, pkg_file) in downloads.items()
+            }
+            fetched = {pkg_name: future.result() for pkg_name, future in futures.items()}
+
+        return [
+            (pkg_name, pkg_file if fetched.get(pkg_name, True) else None)
+            for pkg_name, pkg_file in results
+        ]
+
+    def _get_repo(self, pkg: Package) -> Any:
+        """Return the repository offering a package, or None if unknown."""
+        if not pkg.repo or self.repo_manager is None:
+            return None
+        return self.repo_manager.get_repo(pkg.repo)
+
+    def _apply_all(self, pkg_files: List[Tuple[str, Optional[Path]]]) -> bool:
+        """Install fetched archives one at a time, in the given order."""
+        success = True
+        changed = any(pkg_file is not None for _, pkg_file in pkg_files)
+        if changed:
+            self._start_changes()
+
+        for pkg_name, pkg_file in pkg_files:
+            if pkg_file is not None and self._install_package(pkg_file):
                 print(f"Successfully installed {pkg_name}")
             else:
                 print(f"Failed to install package: {pkg_name}")
                 success = False
-                
+
+        # One index write for the whole batch
+        if changed:
+            self._write_index(self.installed_pkgs.values())
         return success
 
     def remove(self, package_names: List[str], nodeps: bool = False) -> bool:
         """Remove one or more packages."""
         success = True
+        changed = False
         
-        for pkg_name in package_names:
+        # Dependents are removed before the packages they depend on
+        for pkg_name in self._topo_order(package_names, reverse=True):
             if pkg_name not in self.installed_pkgs:
                 print(f"Package {pkg_name} is not installed")
                 continue
@@ -171,40 +528,92 @@ class PackageManager:
             if not nodeps:
                 dependents = self._find_dependents(pkg_name)
                 if dependents:
-                    print(f"Cannot remove {pkg_name}: the following packages depend on it:")
-                    for dep in dependents:
-                        print(f"  {dep}")
+                    # One write for the whole report rather than one per line
+                    print(f"Cannot remove {pkg_name}: the following packages depend on it:\n"
+                          + "\n".join(f"  {dep}" for dep in dependents))
                     success = False
                     continue
             
             # Remove package
+            if not changed:
+                self._start_changes()
+                changed = True
             if self._remove_package(pkg_name):
                 print(f"Successfully removed {pkg_name}")
             else:
                 print(f"Failed to remove package: {pkg_name}")
                 success = False
                 
+        # One index write for the whole batch
+        if changed:
+            self._write_index(self.installed_pkgs.values())
         return success
 
+    def _topo_order(self, names: List[str], reverse: bool = False) -> List[str]:
+        """Order packages so that dependencies come before their dependents.
+
+        Only dependencies between the given packages are considered, using
+        installed metadata first and available package metadata otherwise.
+        Packages caught in a dependency cycle are appended in input order.
+
+        Args:
+            names: Package names to order
+            reverse: Return removal order (dependents first) instead
+
+        Returns:
+            List[str]: The package names in processing order
+        """
+        nodes = list(dict.fromkeys(names))
+        node_set = set(nodes)
+        dependents: Dict[str, List[str]] = {name: [] for name in nodes}
+        in_degree: Dict[str, int] = dict.fromkeys(nodes, 0)
+
+        for name in nodes:
+            pkg = self.installed_pkgs.get(name)
+            if pkg is None:
+                pkg = self._latest_available.get(name)
+            if pkg is None:
+                continue
+
+            for dep in {_dep_name(dep) for dep in pkg.depends}:
+                if dep in node_set and dep != name:
+                    dependents[dep].append(name)
+                    in_degree[name] += 1
+
+        # Kahn's algorithm, seeded in input order to keep the result stable
+        ready = deque(name for name in nodes if in_degree[name] == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in dependents[name]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(nodes):
+            cyclic = [name for name in nodes if in_degree[name] > 0]
+            print(f"Warning: dependency cycle between: {', '.join(cyclic)}")
+            order.extend(cyclic)
+
+        if reverse:
+            order.reverse()
+        return order
+
     def _find_dependents(self, package_name: str) -> List[str]:
         """Find packages that depend on the given package."""
-        dependents = []
-        for pkg in self.installed_pkgs.values():
-            if package_name in pkg.depends:
-                dependents.append(pkg.name)
-        return dependents
+        return sorted(self._get_reverse_deps().get(package_name, ()))
 
     def _remove_package(self, package_name: str) -> bool:
         """Remove a package and its files."""
         try:
             pkg_dir = self.db_path / 'local' / package_name
             if pkg_dir.exists():
-                import shutil
                 shutil.rmtree(pkg_dir)
             
             # Remove from memory
             if package_name in self.installed_pkgs:
-                del self.installed_pkgs[package_name]
+                self._unindex_dependencies(self.installed_pkgs.pop(package_name))
                 
             return True
         except Exception as e:
@@ -213,17 +622,27 @@ class PackageManager:
 
     def search(self, query: str) -> List[Package]:
         """Search for packages matching the query."""
+        return list(self.iter_search(query))
+
+    def iter_search(self, query: str,
+                    installed: Optional[List[Package]] = None) -> Iterator[Package]:
+        """Yield packages matching the query as they are found.
+
+        Args:
+            query: Text to look for in package names and descriptions
+            installed: Snapshot of the installed packages to search instead
+                of the local database
+        """
         # In a real implementation, this would search through repository databases
         # For now, we'll just search in installed packages
-        results = []
         query = query.lower()
         
-        for pkg in self.installed_pkgs.values():
-            if (query in pkg.name.lower() or 
-                query in (pkg.description or "").lower()):
-                results.append(pkg)
-                
-        return results
+        # Iterate over a snapshot so the installed set may change meanwhile
+        if installed is None:
+            installed = list(self.installed_pkgs.values())
+        for pkg in installed:
+            if query in pkg._name_lc or query in pkg._desc_lc:
+                yield pkg
 
     def update(self) -> bool:
         """Update the package database from mirrors."""
@@ -240,17 +659,19 @@ class PackageManager:
             # Upgrade all packages
             package_names = list(self.installed_pkgs.keys())
             
-        success = True
         self.update()  # Make sure we have the latest package info
         
+        to_upgrade = []
         for pkg_name in package_names:
             if pkg_name not in self.installed_pkgs:
                 print(f"Package {pkg_name} is not installed")
                 continue
-                
-            # In a real implementation, check for updates
-            print(f"Checking for updates for {pkg_name}...")
-            # For now, just reinstall the package
-            self.install([pkg_name])
-            
-        return success
\ No newline at end of file
+            to_upgrade.append(pkg_name)
+
+        if not to_upgrade:
+            return True
+
+        # In a real implementation, check for updates
+        print(f"Checking for updates for {len(to_upgrade)} package(s)...")
+        # For now, just reinstall the packages, in a single batch
+        return self.install(to_upgrade)
\ No newline at end of file
@@ -5,23 +5,44 @@ import os
 import json
 import gzip
 import shutil
+from string import Template
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Union
 
+# Default repository location: the Arch Linux geo-balanced mirror, which
+# serves the <repo>.db databases and package archives
+DEFAULT_REPO_URL = "https://geo.mirror.pkgbuild.com/$repo/os/$arch"
+
+
 class Repository:
     """Represents a package repository."""
 
-    def __init__(self, name: str, url: str, sig_level: str = "Optional"):
+    def __init__(self, name: str, url: str, sig_level: str = "Optional",
+                 arch: str = "x86_64", db_path: Optional[Union[str, Path]] = None,
+                 timeout: int = 10):
         """Initialize a repository.
 
         Args:
             name: Repository name
-            url: Repository URL (can be local file:// or remote http://, https://)
+            url: Repository URL (can be local file:// or remote http://, https://).
+                May contain $repo and $arch placeholders.
             sig_level: Signature verification level (e.g., 'Optional', 'Required')
+            arch: Architecture substituted for $arch in the URL
+            db_path: Package database root; the repository database is kept
+                in its sync/ directory. Updates are skipped when not set.
+            timeout: Network timeout in seconds
         """
         self.name = name
         self.url = url
         self.sig_level = sig_level
+        self.arch = arch
+        # Resolve the placeholders once; per-package URLs are a plain concat
+        self._url_prefix = Template(url).safe_substitute(repo=name, arch=arch).rstrip('/') + '/'
+        self.timeout = timeout
+        sync_dir = Path(db_path) / 'sync' if db_path is not None else None
+        self._db_file = sync_dir / f"{name}.db" if sync_dir else None
+        self._meta_file = sync_dir / f"{name}.meta.json" if sync_dir else None
         self.packages: Dict[str, Dict] = {}
         self._initialized = False
 
@@ -37,6 +58,17 @@ class Repository:
         self._initialized = True
         return True
 
+    def url_for(self, filename: str) -> str:
+        """Get the URL of a file in the repository.
+
+        Args:
+            filename: File name relative to the repository root
+
+        Returns:
+            str: Full URL of the file
+        """
+        return self._url_prefix + filename
+
     def add_package(self, pkg_path: str) -> bool:
         """Add a package to the repository.
 
@@ -97,11 +129,65 @@ class Repository:
         Returns:
             bool: True if the update was successful, False otherwise
         """
-        # TODO: Implement repository update
-        # This would involve downloading/updating the repository database
-        # and repopulating self.packages
+        if self._db_file is None or not self._url_prefix.startswith(('http://', 'https://')):
+            return True
+
+        # Revalidate the cached database instead of downloading it again
+        headers = {}
+        meta = self._load_meta() if self._db_file.exists() else {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        # Imported here so that importing this module does not pull in
+        # requests; the downloader's session is shared for keep-alive
+        from .utils.downloader import _SESSION
+
+        url = self.url_for(f"{self.name}.db")
+        tmp_file = self._db_file.with_name(self._db_file.name + '.part')
+        try:
+            with _SESSION.get(url, headers=headers, stream=True,
+                              timeout=self.timeout) as response:
+                if response.status_code == 304:
+                    return True
+                response.raise_for_status()
+
+                self._db_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_file, 'wb') as f:
+                    response.raw.decode_content = True
+                    shutil.copyfileobj(response.raw, f)
+                os.replace(tmp_file, self._db_file)
+
+                self._save_meta({
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                })
+        except Exception as e:
+            print(f"Error updating repository {self.name}: {str(e)}")
+            if tmp_file.exists():
+                tmp_file.unlink()
+            return False
+
+        # TODO: Parse the downloaded database to repopulate self.packages
         return True
 
+    def _load_meta(self) -> Dict[str, Optional[str]]:
+        """Load the cache validators saved by the last successful update."""
+        try:
+            with open(self._meta_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_meta(self, meta: Dict[str, Optional[str]]) -> None:
+        """Save the cache validators of the downloaded database."""
+        try:
+            with open(self._meta_file, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        except OSError as e:
+            print(f"Warning: could not save {self._meta_file}: {str(e)}")
+
     def sync(self) -> bool:
         """Sync local repository with remote changes.
 
@@ -126,9 +212,8 @@ class RepositoryManager:
         """Load configured repositories."""
         # TODO: Load repositories from configuration
         # For now, add some default repositories
-        self.add_repo("core", "https://archlinux.org/packages/core/os/x86_64")
-        self.add_repo("extra", "https://archlinux.org/packages/extra/os/x86_64")
-        self.add_repo("community", "https://archlinux.org/packages/community/os/x86_64")
+        for name in ("core", "extra"):
+            self.add_repo(name, DEFAULT_REPO_URL)
 
     def add_repo(self, name: str, url: str, sig_level: str = "Optional") -> bool:
         """Add a new repository.
@@ -145,7 +230,11 @@ class RepositoryManager:
             print(f"Repository {name} already exists")
             return False
 
-        repo = Repository(name, url, sig_level)
+        repo = Repository(
+            name, url, sig_level,
+            arch=self.config.get('general', 'architecture', fallback='x86_64'),
+            db_path=self.config.get('general', 'db_path', fallback='/var/lib/syzygia'),
+            timeout=int(self.config.get('mirrors', 'timeout', fallback='10')))
         if not repo.initialize():
             print(f"Failed to initialize repository {name}")
             return False
@@ -211,11 +300,25 @@ class RepositoryManager:
         Returns:
             bool: True if all repositories were updated successfully, False otherwise
         """
+        if not self.repos:
+            return True
+
+        # Repository updates are network-bound and independent of each other;
+        # each worker only touches its own repository's state.
         success = True
-        for repo in self.repos.values():
-            if not repo.update():
-                print(f"Failed to update repository {repo.name}")
-                success = False
+        with ThreadPoolExecutor(max_workers=min(32, len(self.repos))) as executor:
+            futures = {executor.submit(repo.update): repo for repo in self.repos.values()}
+            for future in as_completed(futures):
+                repo = futures[future]
+                try:
+                    updated = future.result()
+                except Exception as e:
+                    print(f"Error updating repository {repo.name}: {str(e)}")
+                    updated = False
+
+                if not updated:
+                    print(f"Failed to update repository {repo.name}")
+                    success = False
         return success
 
     def sync_all(self) -> bool:
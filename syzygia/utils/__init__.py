@@ -2,11 +2,12 @@
 
 # Import utility modules
 from .downloader import download_file, verify_checksum
-from .validator import validate_package, validate_repository
+from .validator import validate_batch, validate_package, validate_repository
 
 __all__ = [
     'download_file',
     'verify_checksum',
     'validate_package',
+    'validate_batch',
     'validate_repository'
 ]
@@ -3,13 +3,26 @@
 import hashlib
 import os
 import shutil
+import time
 from pathlib import Path
 from typing import Optional, Tuple, Union, Dict, Any
 
 import requests
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
-def download_file(url: str, destination: Union[str, Path], chunk_size: int = 8192) -> bool:
+# Read/write block size for downloads and checksum verification
+CHUNK_SIZE = 1 << 20
+
+# Shared session so repeated downloads and retries reuse kept-alive
+# connections instead of repeating the TCP/TLS handshake. Retries are left
+# to download_with_retry.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+def download_file(url: str, destination: Union[str, Path], chunk_size: int = CHUNK_SIZE) -> bool:
     """Download a file from a URL to a local destination with progress bar.
     
     Args:
@@ -20,13 +33,16 @@ def download_file(url: str, destination: Union[str, Path], chunk_size: int = 819
     Returns:
         bool: True if download was successful, False otherwise
     """
+    return _download(url, Path(destination), chunk_size)
+
+def _download(url: str, dest_path: Path, chunk_size: int, file_hash: Any = None) -> bool:
+    """Stream url to dest_path, feeding each chunk to file_hash if given."""
     try:
         # Ensure the destination directory exists
-        dest_path = Path(destination)
         dest_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Stream the download to handle large files
-        with requests.get(url, stream=True, timeout=30) as response:
+        with _SESSION.get(url, stream=True, timeout=30) as response:
             response.raise_for_status()
             
             # Get the total file size from headers
@@ -46,6 +62,8 @@ def download_file(url: str, destination: Union[str, Path], chunk_size: int = 819
                 for chunk in response.iter_content(chunk_size=chunk_size):
                     if chunk:  # Filter out keep-alive chunks
                         file_obj.write(chunk)
+                        if file_hash is not None:
+                            file_hash.update(chunk)
                         progress_bar.update(len(chunk))
             
             progress_bar.close()
@@ -94,13 +112,22 @@ def verify_checksum(file_path: Union[str, Path], checksum: str, algorithm: str =
             return False
         
         # Calculate the file's checksum
-        file_hash = hash_func()
-        with open(file_path, 'rb') as file_obj:
-            while True:
-                chunk = file_obj.read(8192)
-                if not chunk:
-                    break
-                file_hash.update(chunk)
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: hashed entirely in C with the GIL released
+            with open(file_path, 'rb') as file_obj:
+                file_hash = hashlib.file_digest(file_obj, hash_func)
+        else:
+            # Read unbuffered into one reusable buffer instead of allocating
+            # a new bytes object per chunk
+            file_hash = hash_func()
+            buffer = bytearray(CHUNK_SIZE)
+            view = memoryview(buffer)
+            with open(file_path, 'rb', buffering=0) as file_obj:
+                while True:
+                    size = file_obj.readinto(buffer)
+                    if not size:
+                        break
+                    file_hash.update(view[:size])
         
         # Compare with the expected checksum (case-insensitive)
         return file_hash.hexdigest().lower() == checksum.lower()
@@ -112,13 +139,57 @@ def verify_checksum(file_path: Union[str, Path], checksum: str, algorithm: str =
         print(f"Unexpected error while verifying checksum: {str(e)}")
         return False
 
+def download_and_verify(
+    url: str,
+    destination: Union[str, Path],
+    checksum: str,
+    algorithm: str = 'sha256',
+    chunk_size: int = CHUNK_SIZE
+) -> bool:
+    """Download a file and verify its checksum in a single pass.
+    
+    The checksum is computed from the chunks as they are written, so the
+    file is never read back from disk. A file that fails verification is
+    removed.
+    
+    Args:
+        url: The URL of the file to download
+        destination: Local path where the file should be saved
+        checksum: Expected checksum value
+        algorithm: Hash algorithm to use (default: 'sha256')
+        chunk_size: Size of chunks to download at a time (in bytes)
+        
+    Returns:
+        bool: True if the file was downloaded and the checksum matches, False otherwise
+    """
+    hash_func = getattr(hashlib, algorithm.lower(), None)
+    if not hash_func:
+        print(f"Error: Unsupported hash algorithm: {algorithm}")
+        return False
+    
+    dest_path = Path(destination)
+    file_hash = hash_func()
+    if not _download(url, dest_path, chunk_size, file_hash):
+        return False
+    
+    # Compare with the expected checksum (case-insensitive)
+    if file_hash.hexdigest().lower() == checksum.lower():
+        return True
+    
+    print(f"Error: Checksum mismatch for {url}")
+    try:
+        os.remove(dest_path)
+    except OSError as e:
+        print(f"Warning: Could not remove corrupted file {dest_path}: {e}")
+    return False
+
 def download_with_retry(
     url: str,
     destination: Union[str, Path],
     max_retries: int = 3,
     checksum: Optional[str] = None,
     checksum_algorithm: str = 'sha256',
-    chunk_size: int = 8192
+    chunk_size: int = CHUNK_SIZE
 ) -> bool:
     """Download a file with retry mechanism and optional checksum verification.
     
@@ -138,28 +209,19 @@ def download_with_retry(
     for attempt in range(max_retries):
         print(f"Download attempt {attempt + 1} of {max_retries} for {url}")
         
-        # Try to download the file
-        if download_file(url, dest_path, chunk_size):
-            # If checksum is provided, verify it
-            if checksum:
-                print("Verifying checksum...")
-                if verify_checksum(dest_path, checksum, checksum_algorithm):
-                    print("Checksum verification successful.")
-                    return True
-                
-                print(f"Checksum verification failed for {url} (attempt {attempt + 1}/{max_retries})")
-                try:
-                    os.remove(dest_path)
-                except OSError as e:
-                    print(f"Warning: Could not remove corrupted file {dest_path}: {e}")
-            else:
+        # Try to download the file, hashing it on the way in if a checksum is provided
+        if checksum:
+            if download_and_verify(url, dest_path, checksum, checksum_algorithm, chunk_size):
+                print("Checksum verification successful.")
                 return True
+            print(f"Download or checksum verification failed for {url} (attempt {attempt + 1}/{max_retries})")
+        elif download_file(url, dest_path, chunk_size):
+            return True
         
         # If we get here, download or verification failed
         if attempt < max_retries - 1:
             retry_delay = 2 ** attempt  # Exponential backoff
             print(f"Waiting {retry_delay} seconds before retry...")
-            import time
             time.sleep(retry_delay)
     
     print(f"Failed to download {url} after {max_retries} attempts")
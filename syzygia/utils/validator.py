@@ -1,11 +1,64 @@
-""
+"""
 Validation utilities for Syzygia
 """
 import os
-import re
+import string
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
+# Characters allowed in package names and versions
+_NAME_CHARS = (string.ascii_letters + string.digits + '@._+-').encode('ascii')
+_VERSION_CHARS = (string.ascii_letters + string.digits + '._+:~-').encode('ascii')
+_HEAD_OK = frozenset(string.ascii_letters + string.digits)
+_TAIL_OK = frozenset(string.ascii_letters + string.digits + '_')
+_PKG_EXTS = ('.pkg.tar.zst', '.pkg.tar.xz', '.pkg.tar.gz', '.pkg.tar.bz2')
+_VALID_SCHEMES = ('http://', 'https://', 'file://', 'ftp://')
+_NAME_LIST_CHARS = _NAME_CHARS + b'\n'
+_DEP_VERSION_CHARS = (string.ascii_letters + string.digits + '.:+~-').encode('ascii')
+
+# Version constraint operators, and a table mapping each character that can
+# start one to NUL so the first operator is found with a single find()
+_DEP_OPS = frozenset({'=', '==', '>=', '<=', '>', '<', '~=', '!='})
+_OP_MASK = bytes.maketrans(b'=<>~!', b'\0\0\0\0\0')
+
+_VALID_ARCHS = frozenset({
+    'x86_64', 'i686', 'i586', 'i486', 'i386',
+    'armv7h', 'aarch64', 'armv6h', 'armv5tel',
+    'ppc64le', 'ppc64', 'ppc', 'riscv64',
+    's390x', 'any'
+})
+_VALID_ARCHS_ERROR = f"Invalid architecture. Must be one of: {', '.join(sorted(_VALID_ARCHS))}"
+
+
+def _has_only(value: str, allowed: bytes) -> bool:
+    """Check that value consists solely of the given ASCII characters.
+
+    bytes.translate deletes every allowed character in a single C-level
+    pass; anything left over is invalid.
+    """
+    return value.isascii() and not value.encode('ascii').translate(None, allowed)
+
+@lru_cache(maxsize=8192)
+def _is_valid_dep(dep: str) -> bool:
+    """Check a "name[op version]" dependency string without the regex engine."""
+    if not dep or not dep.isascii():
+        return False
+
+    # Split at the first operator character, if any
+    i = dep.encode('ascii').translate(_OP_MASK).find(b'\0')
+    if i < 0:
+        return _has_only(dep, _NAME_CHARS)
+    if i == 0 or not _has_only(dep[:i], _NAME_CHARS):
+        return False
+
+    op = dep[i:i + 2]
+    if op not in _DEP_OPS:
+        op = dep[i]
+        if op not in _DEP_OPS:
+            return False
+    return _has_only(dep[i + len(op):], _DEP_VERSION_CHARS)
+
 def validate_package_name(name: str) -> Tuple[bool, str]:
     """
     Validate a package name according to Arch Linux package naming conventions.
@@ -19,18 +72,18 @@ def validate_package_name(name: str) -> Tuple[bool, str]:
     if not name:
         return False, "Package name cannot be empty"
     
-    # Package name must only contain alphanumeric characters, @, ., _ , +, -
-    if not re.match(r'^[a-zA-Z0-9@._+-]+$', name):
-        return False, "Package name contains invalid characters. Only alphanumeric, @, ., _, +, - are allowed."
-    
     # Package name must start with an alphanumeric character
-    if not name[0].isalnum():
+    if name[0] not in _HEAD_OK:
         return False, "Package name must start with an alphanumeric character"
     
     # Package name must end with an alphanumeric character or an underscore
-    if not (name[-1].isalnum() or name[-1] == '_'):
+    if name[-1] not in _TAIL_OK:
         return False, "Package name must end with an alphanumeric character or underscore"
     
+    # Package name must only contain alphanumeric characters, @, ., _ , +, -
+    if not _has_only(name, _NAME_CHARS):
+        return False, "Package name contains invalid characters. Only alphanumeric, @, ., _, +, - are allowed."
+    
     return True, ""
 
 def validate_package_version(version: str) -> Tuple[bool, str]:
@@ -51,7 +104,7 @@ def validate_package_version(version: str) -> Tuple[bool, str]:
         return False, "Version must start with a digit"
     
     # Version can contain alphanumeric characters, ., _, +, :, ~
-    if not re.match(r'^[a-zA-Z0-9._+:~-]+$', version):
+    if not _has_only(version, _VERSION_CHARS):
         return False, "Version contains invalid characters"
     
     return True, ""
@@ -66,18 +119,11 @@ def validate_package_architecture(arch: str) -> Tuple[bool, str]:
     Returns:
         Tuple[bool, str]: (is_valid, error_message)
     """
-    valid_archs = {
-        'x86_64', 'i686', 'i586', 'i486', 'i386',
-        'armv7h', 'aarch64', 'armv6h', 'armv5tel',
-        'ppc64le', 'ppc64', 'ppc', 'riscv64',
-        's390x', 'any'
-    }
-    
     if not arch:
         return False, "Architecture cannot be empty"
     
-    if arch not in valid_archs:
-        return False, f"Invalid architecture. Must be one of: {', '.join(sorted(valid_archs))}"
+    if arch not in _VALID_ARCHS:
+        return False, _VALID_ARCHS_ERROR
     
     return True, ""
 
@@ -94,15 +140,23 @@ def validate_package_dependencies(deps: List[str]) -> Tuple[bool, str]:
     if not isinstance(deps, list):
         return False, "Dependencies must be a list"
     
+    # Fast path: a list of plain package names is checked with one scan over
+    # the joined list instead of one check per entry
+    try:
+        joined = '\n'.join(deps)
+    except TypeError:
+        joined = None  # Non-string entries are reported below
+    if (joined is not None and '' not in deps
+            and joined.count('\n') == len(deps) - 1
+            and _has_only(joined, _NAME_LIST_CHARS)):
+        return True, ""
+    
     for dep in deps:
         if not isinstance(dep, str):
             return False, f"Dependency must be a string, got {type(dep).__name__}"
         
-        # Check for valid dependency format: name[=><~!]*[0-9.:]*
-        if not re.match(r'^[a-zA-Z0-9@._+-]+([=><~!]?=|[><]=?|~=)[0-9a-zA-Z.:+~-]*$', dep):
-            # Check if it's just a package name without version constraints
-            if not re.match(r'^[a-zA-Z0-9@._+-]+$', dep):
-                return False, f"Invalid dependency format: {dep}"
+        if not _is_valid_dep(dep):
+            return False, f"Invalid dependency format: {dep}"
     
     return True, ""
 
@@ -110,37 +164,69 @@ def validate_package_metadata(metadata: Dict) -> Tuple[bool, str]:
     """
     Validate package metadata.
     
+    Results are memoized on the fields that affect validity, so a package
+    seen repeatedly during dependency resolution is only validated once.
+    
     Args:
         metadata: Dictionary containing package metadata
         
     Returns:
         Tuple[bool, str]: (is_valid, error_message)
     """
-    required_fields = ['name', 'version', 'description', 'arch', 'license', 'depends']
-    
-    for field in required_fields:
-        if field not in metadata:
+    key = _metadata_key(metadata)
+    if key is None:
+        return _validate_metadata(metadata)
+    return _validate_metadata_cached(key)
+
+def _metadata_key(metadata: Dict) -> Optional[Tuple]:
+    """Build the memoization key of a metadata record, or None if it has none.
+
+    Only well-formed records (all required fields present, dependency
+    fields given as lists, hashable values) get a key.
+    """
+    try:
+        depends = metadata['depends']
+        optdepends = metadata.get('optdepends')
+        if type(depends) is not list or not (optdepends is None or type(optdepends) is list):
+            return None
+        if 'description' not in metadata or 'license' not in metadata:
+            return None
+        key = (
+            metadata['name'], metadata['version'], metadata['arch'],
+            tuple(depends),
+            tuple(optdepends) if 'optdepends' in metadata else None,
+            'size' not in metadata or isinstance(metadata['size'], int),
+        )
+        hash(key)
+    except (KeyError, TypeError):
+        return None
+    return key
+
+@lru_cache(maxsize=4096)
+def _validate_metadata_cached(key: Tuple) -> Tuple[bool, str]:
+    """Validate the record a key from _metadata_key was built from."""
+    name, version, arch, depends, optdepends, size_ok = key
+    metadata = {
+        'name': name, 'version': version, 'description': '',
+        'arch': arch, 'license': '', 'depends': list(depends),
+    }
+    if optdepends is not None:
+        metadata['optdepends'] = list(optdepends)
+    if not size_ok:
+        metadata['size'] = None
+    return _validate_metadata(metadata)
+
+def _validate_metadata(metadata: Dict) -> Tuple[bool, str]:
+    """Validate package metadata without memoization."""
+    # Each required field is fetched once and validated right away
+    for field, validator, prefix in _REQUIRED_FIELDS:
+        value = metadata.get(field, _MISSING)
+        if value is _MISSING:
             return False, f"Missing required field: {field}"
-    
-    # Validate name
-    is_valid, error = validate_package_name(metadata['name'])
-    if not is_valid:
-        return False, f"Invalid package name: {error}"
-    
-    # Validate version
-    is_valid, error = validate_package_version(metadata['version'])
-    if not is_valid:
-        return False, f"Invalid version: {error}"
-    
-    # Validate architecture
-    is_valid, error = validate_package_architecture(metadata['arch'])
-    if not is_valid:
-        return False, f"Invalid architecture: {error}"
-    
-    # Validate dependencies
-    is_valid, error = validate_package_dependencies(metadata.get('depends', []))
-    if not is_valid:
-        return False, f"Invalid dependencies: {error}"
+        if validator is not None:
+            is_valid, error = validator(value)
+            if not is_valid:
+                return False, f"{prefix}: {error}"
     
     # Validate optional fields if present
     if 'optdepends' in metadata:
@@ -154,6 +240,21 @@ def validate_package_metadata(metadata: Dict) -> Tuple[bool, str]:
     
     return True, ""
 
+def validate_batch(metadata_list: List[Dict]) -> List[Tuple[bool, str]]:
+    """
+    Validate many package metadata records, e.g. a whole repository index.
+    
+    Dependency strings repeat heavily across a repository (glibc, bash, ...),
+    and each distinct one is only parsed once.
+    
+    Args:
+        metadata_list: Package metadata dictionaries
+        
+    Returns:
+        List[Tuple[bool, str]]: (is_valid, error_message) for each record, in order
+    """
+    return [validate_package_metadata(metadata) for metadata in metadata_list]
+
 def validate_package_file(file_path: Union[str, Path]) -> Tuple[bool, str]:
     """
     Validate a package file.
@@ -164,18 +265,23 @@ def validate_package_file(file_path: Union[str, Path]) -> Tuple[bool, str]:
     Returns:
         Tuple[bool, str]: (is_valid, error_message)
     """
-    file_path = Path(file_path)
+    # Plain strings and a single stat; no Path objects on this hot path
+    file_path = os.fspath(file_path)
     
-    # Check if file exists
-    if not file_path.exists():
+    # Check if file exists; the same stat result is reused for the size check
+    try:
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
         return False, f"File does not exist: {file_path}"
+    except OSError as e:
+        return False, f"Cannot access file {file_path}: {e.strerror}"
     
     # Check file extension
-    if file_path.suffix not in ('.pkg.tar.zst', '.pkg.tar.xz', '.pkg.tar.gz', '.pkg.tar.bz2'):
-        return False, f"Invalid package file extension: {file_path.suffix}"
+    if not file_path.endswith(_PKG_EXTS):
+        return False, f"Invalid package file extension: {os.path.splitext(file_path)[1]}"
     
     # Check file size
-    if file_path.stat().st_size == 0:
+    if st.st_size == 0:
         return False, "Package file is empty"
     
     # TODO: Add more comprehensive validation, e.g., check package content
@@ -192,18 +298,22 @@ def validate_repository(path: Union[str, Path]) -> Tuple[bool, str]:
     Returns:
         Tuple[bool, str]: (is_valid, error_message)
     """
-    path = Path(path)
-    
-    # Check if path exists and is a directory
-    if not path.exists():
+    path = os.fspath(path)
+    
+    # One directory read both checks the path and lists the files present,
+    # instead of a stat per required file
+    try:
+        with os.scandir(path) as entries:
+            present = {entry.name for entry in entries}
+    except FileNotFoundError:
         return False, f"Repository directory does not exist: {path}"
-    if not path.is_dir():
+    except NotADirectoryError:
         return False, f"Repository path is not a directory: {path}"
     
     # Check for required files
     required_files = ['syzygia.db', 'syzygia.db.sig', 'syzygia.files', 'syzygia.files.sig']
     for file in required_files:
-        if not (path / file).exists():
+        if file not in present:
             return False, f"Missing required repository file: {file}"
     
     # TODO: Add more comprehensive validation, e.g., check database integrity
@@ -224,7 +334,7 @@ def validate_mirror_url(url: str) -> Tuple[bool, str]:
         return False, "URL cannot be empty"
     
     # Check for valid URL scheme
-    if not (url.startswith('http://') or url.startswith('https://') or url.startswith('file://') or url.startswith('ftp://')):
+    if not url.startswith(_VALID_SCHEMES):
         return False, "URL must start with http://, https://, file://, or ftp://"
     
     # For file URLs, check if the path exists
@@ -235,5 +345,16 @@ def validate_mirror_url(url: str) -> Tuple[bool, str]:
     
     return True, ""
 
+# Required metadata fields as (field, validator, error prefix), in check order
+_MISSING = object()
+_REQUIRED_FIELDS = (
+    ('name', validate_package_name, "Invalid package name"),
+    ('version', validate_package_version, "Invalid version"),
+    ('description', None, None),
+    ('arch', validate_package_architecture, "Invalid architecture"),
+    ('license', None, None),
+    ('depends', validate_package_dependencies, "Invalid dependencies"),
+)
+
 # Alias for backward compatibility
 validate_package = validate_package_metadata
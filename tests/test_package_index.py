@@ -0,0 +1,101 @@
+"""Tests for the packed index of installed packages."""
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from syzygia.package import PackageManager
+
+
+class _Config:
+    """Minimal stand-in for syzygia.config.Config."""
+
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, section, option, fallback=None):
+        return self.values.get((section, option), fallback)
+
+
+class PackageIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.config = _Config({
+            ('general', 'db_path'): str(self.root / 'db'),
+            ('general', 'cache_dir'): str(self.root / 'cache'),
+        })
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _manager(self):
+        return PackageManager(self.config, mirror_manager=None)
+
+    def _write_desc(self, name):
+        pkg_dir = self.root / 'db' / 'local' / name
+        pkg_dir.mkdir(parents=True)
+        (pkg_dir / 'desc').write_text(f"name: {name}\nversion: 1.0\n")
+
+    def test_index_is_built_from_desc_files(self):
+        self._write_desc('foo')
+        self.assertEqual(sorted(self._manager().installed_pkgs), ['foo'])
+        # Reading never writes the index; the next batch of changes does
+        self.assertFalse((self.root / 'db' / 'local' / 'index.json').exists())
+
+        self._manager()._apply_all([('bar', self.root / 'cache' / 'bar-1.0.0.pkg.tar.zst')])
+        self.assertTrue((self.root / 'db' / 'local' / 'index.json').exists())
+        self.assertEqual(sorted(self._manager().installed_pkgs), ['bar', 'foo'])
+
+    def test_failed_index_write_does_not_hide_new_package(self):
+        self._write_desc('foo')
+        self._manager().list_installed()
+
+        # Make the next index write fail after the desc file is written
+        pm = self._manager()
+        with mock.patch('syzygia.package.os.replace', side_effect=OSError('disk full')):
+            self.assertTrue(pm._apply_all([('baz', self.root / 'cache' / 'baz-1.0.0.pkg.tar.zst')]))
+
+        pm = self._manager()
+        self.assertIn('baz', pm.installed_pkgs)
+        self.assertEqual(sorted(pkg.name for pkg in pm.list_installed()), ['baz', 'foo'])
+
+    def test_index_is_written_once_per_batch(self):
+        pm = self._manager()
+        pm.list_installed()
+        with mock.patch.object(pm, '_write_index', wraps=pm._write_index) as write_index:
+            pm._apply_all([(name, self.root / 'cache' / f'{name}-1.0.0.pkg.tar.zst')
+                           for name in ('foo', 'bar', 'baz')])
+            self.assertEqual(write_index.call_count, 1)
+            self.assertTrue(pm.remove(['foo', 'bar']))
+            self.assertEqual(write_index.call_count, 2)
+
+        self.assertEqual(sorted(self._manager().installed_pkgs), ['baz'])
+
+    def test_interrupted_batch_does_not_hide_new_package(self):
+        pm = self._manager()
+        pm._apply_all([('foo', self.root / 'cache' / 'foo-1.0.0.pkg.tar.zst')])
+
+        pm = self._manager()
+        with mock.patch.object(pm, '_write_index', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                pm._apply_all([('bar', self.root / 'cache' / 'bar-1.0.0.pkg.tar.zst')])
+
+        self.assertEqual(sorted(self._manager().installed_pkgs), ['bar', 'foo'])
+
+    def test_removed_package_stays_removed(self):
+        pm = self._manager()
+        pm._apply_all([(name, self.root / 'cache' / f'{name}-1.0.0.pkg.tar.zst')
+                       for name in ('a', 'b')])
+
+        # A fresh manager has not loaded the index before removing
+        pm = self._manager()
+        self.assertTrue(pm.remove(['a'], nodeps=True))
+        self.assertNotIn('a', pm.installed_pkgs)
+        self.assertEqual(sorted(pm.installed_pkgs), ['b'])
+        self.assertEqual(sorted(self._manager().installed_pkgs), ['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,42 +1,159 @@
+import gzip
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import (Response, jsonify, redirect, render_template, request,
+                   stream_with_context, url_for)
+
+# Compiled once; render_template_string would recompile the source on every
+# request. render_template accepts the Template object directly.
+_INDEX_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
+# Installed-package list shared between requests for a short time; routes
+# that change the installed set invalidate it
+_INSTALLED_TTL = 2.0
+_INSTALLED_CACHE = {'ts': 0.0, 'val': None}
+
+# PackageManager is not thread-safe; background jobs hold this lock for their
+# whole run, and request threads take it only to refresh the snapshot above
+_PM_LOCK = threading.Lock()
+
+def _locked(func, *args):
+    """Call a PackageManager method while holding _PM_LOCK."""
+    with _PM_LOCK:
+        return func(*args)
+
+def _get_installed():
+    """Return the installed packages, refetching once the cache is stale.
+
+    While a job holds the package manager, the last snapshot is served
+    instead of waiting for the job to finish.
+    """
+    now = time.monotonic()
+    cached = _INSTALLED_CACHE['val']
+    if cached is None or now - _INSTALLED_CACHE['ts'] >= _INSTALLED_TTL:
+        # Only the very first request has nothing to fall back on
+        if not _PM_LOCK.acquire(blocking=cached is None):
+            return cached
+        try:
+            _INSTALLED_CACHE['val'] = pkg_manager.list_installed()
+            _INSTALLED_CACHE['ts'] = now
+        finally:
+            _PM_LOCK.release()
+    return _INSTALLED_CACHE['val']
+
+def _invalidate_installed():
+    """Mark the cached installed-package list stale, keeping it as a fallback."""
+    _INSTALLED_CACHE['ts'] = 0.0
+
+# Package operations run in the background so a slow install does not hold a
+# request thread. A single worker keeps them serialized with each other;
+# _PM_LOCK serializes them with the request threads.
+_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+_JOBS = {}
+_JOBS_LOCK = threading.Lock()
+_JOB_IDS = itertools.count(1)
+_MAX_JOBS = 100
+
+def _submit(action, func, package_name):
+    """Queue a package operation and record it for /status."""
+    future = _EXECUTOR.submit(_locked, func, [package_name])
+    future.add_done_callback(lambda _: _invalidate_installed())
+    with _JOBS_LOCK:
+        _JOBS[next(_JOB_IDS)] = (action, package_name, future)
+        # Forget the oldest finished jobs
+        finished = [job_id for job_id, job in _JOBS.items() if job[2].done()]
+        for job_id in finished[:-_MAX_JOBS]:
+            del _JOBS[job_id]
+
+# Responses smaller than this are not worth compressing
+_GZIP_MIN_SIZE = 500
+
+@app.after_request
+def _gzip_response(response):
+    """Gzip buffered responses for clients that accept it."""
+    if (response.is_streamed or response.direct_passthrough
+            or response.status_code < 200 or response.status_code >= 300
+            or "Content-Encoding" in response.headers
+            or "gzip" not in request.headers.get("Accept-Encoding", "").lower()):
+        return response
+
+    data = response.get_data()
+    if len(data) < _GZIP_MIN_SIZE:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
 
 @app.route("/")
 def index():
-    installed_packages = pkg_manager.list_installed()
-    return render_template_string(HTML_TEMPLATE, 
-                               installed_packages=installed_packages,
-                               search_results=None)
+    installed_packages = _get_installed()
+    return render_template(_INDEX_TEMPLATE, 
+                           installed_packages=installed_packages,
+                           search_results=None)
 
 @app.route("/install", methods=["POST"])
 def install_package():
     package_name = request.form.get("package_name")
     if package_name:
-        pkg_manager.install([package_name])
+        _submit("install", pkg_manager.install, package_name)
     return redirect(url_for("index"))
 
 @app.route("/install/<package_name>")
 def install_package_get(package_name):
-    pkg_manager.install([package_name])
+    _submit("install", pkg_manager.install, package_name)
     return redirect(url_for("index"))
 
 @app.route("/remove/<package_name>")
 def remove_package(package_name):
-    pkg_manager.remove([package_name])
+    _submit("remove", pkg_manager.remove, package_name)
     return redirect(url_for("index"))
 
 @app.route("/upgrade/<package_name>")
 def upgrade_package(package_name):
-    pkg_manager.upgrade([package_name])
+    _submit("upgrade", pkg_manager.upgrade, package_name)
     return redirect(url_for("index"))
 
+@app.route("/status")
+def job_status():
+    with _JOBS_LOCK:
+        jobs = list(_JOBS.items())
+
+    def state(future):
+        if future.running():
+            return "running"
+        if not future.done():
+            return "queued"
+        if future.exception() is not None:
+            return "error"
+        return "done" if future.result() else "failed"
+
+    return jsonify([
+        {"id": job_id, "action": action, "package": package_name, "state": state(future)}
+        for job_id, (action, package_name, future) in jobs
+    ])
+
 @app.route("/search")
 def search_packages():
     query = request.args.get("query", "")
-    search_results = pkg_manager.search(query) if query else []
-    installed_packages = pkg_manager.list_installed()
-    return render_template_string(HTML_TEMPLATE,
-                               installed_packages=installed_packages,
-                               search_results=search_results)
+    # Results are streamed into the page as the search yields them. They come
+    # from the installed snapshot, so a running job never blocks the page.
+    installed = _get_installed()
+    context = {
+        "installed_packages": installed,
+        "search_results": pkg_manager.iter_search(query, installed) if query else [],
+    }
+    app.update_template_context(context)
+    return Response(stream_with_context(_INDEX_TEMPLATE.stream(context)),
+                    mimetype="text/html")
 
+# Development server only; production runs under gunicorn (see Procfile)
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)), debug=True)
+    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)),
+            debug=os.environ.get("FLASK_DEBUG") == "1")
 